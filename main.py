@@ -5,6 +5,8 @@ import textwrap
 import time
 from typing import Any
 
+import stats
+
 
 class Menu(tkinter.Frame):
     def __init__(self, _root, *args, **kwargs):
@@ -20,6 +22,9 @@ class Menu(tkinter.Frame):
         self.current_val = 5
         self.current_xor = False
         self.auto_next = False
+        self.moves = 0
+        self.optimal_moves = 0
+        self.stats = stats.StatsStore()
         self.possible_operation = {
             "or": lambda x, y: x or y,
             "nor": lambda x, y: not (x or y),
@@ -169,6 +174,19 @@ class Menu(tkinter.Frame):
             )
         return output_list
 
+    def minimum_moves(self, button_list: list[bool]) -> int:
+        # Fewest flips from the starting inputs to any input reaching the answer
+        best = len(button_list)
+        for input_data in itertools.product([True, False], repeat=len(button_list)):
+            output = list(input_data)
+            for line in self.game_data[:0:-1]:
+                output = self.generate_output(list(line[0]), output)
+            if output[0] == self.answer:
+                best = min(
+                    best, sum(a != b for a, b in zip(input_data, button_list))
+                )
+        return best
+
     def help_ui(self):
         for item in self.winfo_children():
             item.destroy()
@@ -210,6 +228,64 @@ class Menu(tkinter.Frame):
         )
         back_btn.pack(pady=5, anchor=tkinter.S)
 
+    def stats_ui(self):
+        for item in self.winfo_children():
+            item.destroy()
+        title = tkinter.Label(
+            self,
+            text="Statistics",
+            font=("Arial", 20),
+            anchor=tkinter.N,
+            bg="#808080",
+            fg="#ffffff",
+        )
+        title.pack(pady=10)
+
+        lines = [
+            f"{'Level':<7}{'XOR':<5}{'Wins':>6}"
+            f"{'Best':>8}{'Median':>8}{'P90':>8}{'Extra':>7}"
+        ]
+        for entry in self.stats.summary():
+            lines.append(
+                f"{entry['levels']:<7}{'Yes' if entry['xor'] else 'No':<5}{entry['count']:>6}"
+                f"{entry['best']:>7.2f}s{entry['median']:>7.1f}s{entry['p90']:>7.1f}s"
+                f"{entry['extra_moves']:>7.2f}"
+            )
+        if len(lines) == 1:
+            lines.append("No games finished yet.")
+        table = tkinter.Label(
+            self,
+            text="\n".join(lines),
+            font=("Courier", 12),
+            justify=tkinter.LEFT,
+            bg="#808080",
+            fg="#ffffff",
+        )
+        table.pack(pady=10)
+
+        streak = tkinter.Label(
+            self,
+            text=f"Best streak of optimal solves: {self.stats.best_streak()}",
+            font=("Arial", 15),
+            bg="#808080",
+            fg="#ffffff",
+        )
+        streak.pack(pady=10)
+
+        back_btn = tkinter.Button(
+            self,
+            text="Back to Menu",
+            font=("Arial", 10),
+            command=self.main_ui,
+            height=3,
+            width=20,
+            bg="#303030",
+            fg="#ffffff",
+            activebackground="#515151",
+            activeforeground="#aaffaa",
+        )
+        back_btn.pack(pady=5, anchor=tkinter.S)
+
     def game_process(self):
         if self.done:
             self.done = False
@@ -217,6 +293,7 @@ class Menu(tkinter.Frame):
 
         def answer_button(answer):
             self.button_list[answer // 2] = not self.button_list[answer // 2]
+            self.moves += 1
             self.game_data[-1][1] = self.button_list
             for o, _ in enumerate(self.game_data[:-1]):
                 self.game_data[-o - 2][1] = self.generate_output(
@@ -228,6 +305,14 @@ class Menu(tkinter.Frame):
             if self.answer == self.game_data[0][1][0] and not self.done:
                 self.wins += 1
                 self.done = True
+                time_taken = time.time() - self.start_time
+                self.stats.record(
+                    self.current_val,
+                    self.current_xor,
+                    time_taken,
+                    self.moves,
+                    self.optimal_moves,
+                )
                 if self.auto_next:
                     self.game_process()
                 else:
@@ -250,7 +335,6 @@ class Menu(tkinter.Frame):
                         pady=5,
                         sticky=tkinter.S,
                     )
-                    time_taken = time.time() - self.start_time
                     timer = tkinter.Label(
                         self,
                         text=f"Time: {time_taken:.2f}s",
@@ -362,6 +446,8 @@ class Menu(tkinter.Frame):
                 self.answer = self.game_data[0][1][0]
                 tries = 0
         self.button_list = button_list
+        self.moves = 0
+        self.optimal_moves = self.minimum_moves(button_list)
         self.start_time = time.time()
         for item in self.winfo_children():
             item.destroy()
@@ -620,6 +706,20 @@ class Menu(tkinter.Frame):
         )
         help_btn.pack(pady=1, anchor=tkinter.S)
 
+        stats_btn = tkinter.Button(
+            self,
+            text="Statistics",
+            font=("Arial", 10),
+            command=self.stats_ui,
+            height=5,
+            width=20,
+            bg="#303030",
+            fg="#ffffff",
+            activebackground="#515151",
+            activeforeground="#aaffaa",
+        )
+        stats_btn.pack(pady=1, anchor=tkinter.S)
+
         exit_btn = tkinter.Button(
             self,
             text="Exit",
@@ -643,8 +743,9 @@ class Menu(tkinter.Frame):
 
 
 def main(__root):
-    Menu(__root)
+    menu = Menu(__root)
     __root.mainloop()
+    menu.stats.close()
 
 
 if __name__ == "__main__":
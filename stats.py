@@ -0,0 +1,218 @@
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+# Solve times are bucketed to a tenth of a second for percentile queries.
+BUCKETS_PER_SECOND = 10
+
+# A failed batch is retried this many times before it is dropped.
+WRITE_ATTEMPTS = 3
+
+# Seconds a write waits for a lock held by another running game.
+LOCK_TIMEOUT = 5.0
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stats.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    levels INTEGER NOT NULL,
+    xor INTEGER NOT NULL,
+    solve_time REAL NOT NULL,
+    moves INTEGER NOT NULL,
+    optimal_moves INTEGER NOT NULL,
+    streak INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_streak ON results (streak);
+CREATE TABLE IF NOT EXISTS level_totals (
+    levels INTEGER NOT NULL,
+    xor INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    best REAL NOT NULL,
+    extra_moves INTEGER NOT NULL,
+    PRIMARY KEY (levels, xor)
+);
+CREATE TABLE IF NOT EXISTS solve_times (
+    levels INTEGER NOT NULL,
+    xor INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (levels, xor, bucket)
+);
+"""
+
+
+class StatsStore:
+    # Results are queued by the UI and written in batches by a background
+    # thread, so recording a win never waits on the disk.
+    def __init__(
+            self, path: str = DEFAULT_PATH, batch_size: int = 256, flush_interval: float = 1.0
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = queue.Queue()
+        self.connection = self.connect()
+        self.connection.executescript(SCHEMA)
+        row = self.connection.execute(
+            "SELECT streak FROM results ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        self.streak = row[0] if row else 0
+        self.writer = threading.Thread(target=self.write_loop, daemon=True)
+        self.writer.start()
+
+    def connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def record(
+            self, levels: int, xor: bool, solve_time: float, moves: int, optimal_moves: int
+    ):
+        self.pending.put(
+            (time.time(), levels, int(xor), solve_time, moves, optimal_moves)
+        )
+
+    def write_loop(self):
+        connection = self.connect()
+        closing = False
+        while not closing:
+            try:
+                item = self.pending.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = []
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.pending.get_nowait()
+                except queue.Empty:
+                    break
+            else:
+                closing = True
+            if batch:
+                self.try_write_batch(connection, batch)
+        connection.close()
+
+    def try_write_batch(self, connection: sqlite3.Connection, batch: list):
+        # A locked or unwritable database must not kill the writer thread,
+        # otherwise every later result would pile up in the queue unwritten.
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                self.write_batch(connection, batch)
+                return
+            except sqlite3.Error:
+                logger.exception(
+                    "Writing %d results failed (attempt %d of %d)",
+                    len(batch),
+                    attempt,
+                    WRITE_ATTEMPTS,
+                )
+                if attempt < WRITE_ATTEMPTS:
+                    time.sleep(self.flush_interval)
+        logger.error("Dropping %d results", len(batch))
+
+    def write_batch(self, connection: sqlite3.Connection, batch: list):
+        # The optimal-solve streak is carried on each row so the best streak
+        # is a single index lookup, and the per-level totals and solve time
+        # histogram are kept up to date here so the dashboard never has to
+        # scan the results table.
+        streak = self.streak
+        rows = []
+        totals = []
+        buckets = []
+        for finished_at, levels, xor, solve_time, moves, optimal_moves in batch:
+            streak = streak + 1 if moves <= optimal_moves else 0
+            rows.append(
+                (finished_at, levels, xor, solve_time, moves, optimal_moves, streak)
+            )
+            totals.append((levels, xor, solve_time, moves - optimal_moves))
+            buckets.append((levels, xor, int(solve_time * BUCKETS_PER_SECOND)))
+        with connection:
+            connection.executemany(
+                "INSERT INTO results "
+                "(finished_at, levels, xor, solve_time, moves, optimal_moves, streak) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            connection.executemany(
+                "INSERT INTO level_totals (levels, xor, count, best, extra_moves) "
+                "VALUES (?, ?, 1, ?, ?) ON CONFLICT (levels, xor) DO UPDATE SET "
+                "count = count + 1, best = MIN(best, excluded.best), "
+                "extra_moves = extra_moves + excluded.extra_moves",
+                totals,
+            )
+            connection.executemany(
+                "INSERT INTO solve_times (levels, xor, bucket, count) "
+                "VALUES (?, ?, ?, 1) ON CONFLICT (levels, xor, bucket) DO UPDATE SET "
+                "count = count + 1",
+                buckets,
+            )
+        self.streak = streak
+
+    def close(self):
+        self.pending.put(None)
+        self.writer.join()
+        self.connection.close()
+
+    def percentiles(self, levels: int, xor: bool, points: tuple = (0.5, 0.9)) -> dict:
+        # Each percentile is the lower edge of its bucket, raised to the exact
+        # best time so it never reads faster than the fastest solve.
+        output = {}
+        row = self.connection.execute(
+            "SELECT best FROM level_totals WHERE levels = ? AND xor = ?",
+            (levels, int(xor)),
+        ).fetchone()
+        if row is None:
+            return output
+        histogram = self.connection.execute(
+            "SELECT bucket, count FROM solve_times WHERE levels = ? AND xor = ? "
+            "ORDER BY bucket",
+            (levels, int(xor)),
+        ).fetchall()
+        if not histogram:
+            return output
+        total = sum(count for _, count in histogram)
+        for point in points:
+            seen = 0
+            for bucket, count in histogram:
+                seen += count
+                if seen >= point * total:
+                    break
+            output[point] = max(bucket / BUCKETS_PER_SECOND, row[0])
+        return output
+
+    def summary(self) -> list[dict]:
+        output = []
+        groups = self.connection.execute(
+            "SELECT levels, xor, count, best, extra_moves FROM level_totals "
+            "ORDER BY levels, xor"
+        ).fetchall()
+        for levels, xor, count, best, extra_moves in groups:
+            times = self.percentiles(levels, bool(xor))
+            output.append(
+                {
+                    "levels": levels,
+                    "xor": bool(xor),
+                    "count": count,
+                    "best": best,
+                    "median": times[0.5],
+                    "p90": times[0.9],
+                    "extra_moves": extra_moves / count,
+                }
+            )
+        return output
+
+    def best_streak(self) -> int:
+        # Only written rows count; self.streak belongs to the writer thread.
+        row = self.connection.execute("SELECT MAX(streak) FROM results").fetchone()
+        return row[0] or 0
@@ -0,0 +1,121 @@
+import sqlite3
+import threading
+
+import pytest
+
+import stats
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "stats.db")
+
+
+def record_times(store, times, levels=5, xor=False):
+    for solve_time in times:
+        store.record(levels, xor, solve_time, 1, 1)
+
+
+def test_summary_after_reopen(path):
+    store = stats.StatsStore(path)
+    store.record(5, False, 2.0, 3, 1)
+    store.record(5, False, 4.0, 1, 1)
+    store.record(3, True, 1.5, 2, 2)
+    store.close()
+
+    store = stats.StatsStore(path)
+    summary = store.summary()
+    store.close()
+    assert [(entry["levels"], entry["xor"], entry["count"]) for entry in summary] == [
+        (3, True, 1),
+        (5, False, 2),
+    ]
+    assert summary[1]["best"] == 2.0
+    assert summary[1]["extra_moves"] == 1.0
+
+
+def test_streak_carries_over_reopen(path):
+    store = stats.StatsStore(path)
+    store.record(5, False, 1.0, 4, 1)
+    store.record(5, False, 1.0, 1, 1)
+    store.record(5, False, 1.0, 1, 1)
+    store.close()
+
+    store = stats.StatsStore(path)
+    assert store.best_streak() == 2
+    store.record(5, False, 1.0, 1, 1)
+    store.close()
+
+    store = stats.StatsStore(path)
+    assert store.best_streak() == 3
+    store.close()
+
+
+def test_batch_size_is_respected(path):
+    entered = threading.Event()
+    release = threading.Event()
+    sizes = []
+
+    class BlockingStore(stats.StatsStore):
+        def write_batch(self, connection, batch):
+            sizes.append(len(batch))
+            entered.set()
+            release.wait()
+            super().write_batch(connection, batch)
+
+    store = BlockingStore(path, batch_size=4)
+    store.record(5, False, 1.0, 1, 1)
+    entered.wait()
+    record_times(store, [1.0] * 9)
+    release.set()
+    store.close()
+    assert sizes == [1, 4, 4, 1]
+
+
+def test_failed_batch_is_retried(path):
+    calls = []
+
+    class FlakyStore(stats.StatsStore):
+        def write_batch(self, connection, batch):
+            calls.append(len(batch))
+            if len(calls) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            super().write_batch(connection, batch)
+
+    store = FlakyStore(path, flush_interval=0.01)
+    store.record(5, False, 1.0, 1, 1)
+    store.close()
+
+    store = stats.StatsStore(path)
+    assert store.summary()[0]["count"] == 1
+    assert store.best_streak() == 1
+    store.close()
+
+
+def test_single_result_percentiles_match_best(path):
+    store = stats.StatsStore(path)
+    record_times(store, [10.0])
+    store.close()
+
+    store = stats.StatsStore(path)
+    summary = store.summary()[0]
+    store.close()
+    assert summary["best"] == summary["median"] == summary["p90"] == 10.0
+
+
+def test_percentiles_use_lower_bucket_edge(path):
+    store = stats.StatsStore(path)
+    record_times(store, [0.95, 1.23, 2.5, 3.01, 3.02])
+    store.close()
+
+    store = stats.StatsStore(path)
+    times = store.percentiles(5, False, (0.0, 0.5, 1.0))
+    store.close()
+    assert times == {0.0: 0.95, 0.5: 2.5, 1.0: 3.0}
+
+
+def test_percentiles_without_results(path):
+    store = stats.StatsStore(path)
+    assert store.percentiles(5, False) == {}
+    assert store.best_streak() == 0
+    store.close()